@@ -1,14 +1,18 @@
 # chaos_controller.py
 import argparse
 import logging
+import signal
+import threading
 import yaml
-import time
 from safety import SafetyChecker
 from experiments import ExperimentRunner
 
+# Prefer the libyaml-backed C loader when PyYAML was built with it
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_experiment(file_path):
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+    with open(file_path, 'rb') as f:
+        return yaml.load(f, Loader=_LOADER)
 
 def main():
     parser = argparse.ArgumentParser(description='Chaos Engineering Mini-Framework')
@@ -38,7 +42,12 @@ def main():
     runner = ExperimentRunner()
     try:
         runner.start(experiment)
-        time.sleep(experiment['duration'])
+        stop_event = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        if not runner.wait(experiment['duration'], stop_event) and stop_event.is_set():
+            logging.warning("Experiment terminated by signal")
+            runner.emergency_stop()
+            return
         results = runner.stop()
         logging.info(f"Experiment completed: {results}")
     except Exception as e:
@@ -1,158 +1,332 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
+import functools
 import logging
+import queue
+import shlex
+import signal
 import sys
+import threading
 import yaml
 import os
-from safety import SafetyChecker
-from experiments import ExperimentRunner
-from monitoring import MonitoringClient
-from reporting import ExperimentReporter
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from types import MappingProxyType
 
 VERSION = "0.1.0"
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+class _BatchingStreamHandler(logging.StreamHandler):
+    """StreamHandler that holds formatted records until flushed, then writes them in one call."""
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._pending = []
+
+    def emit(self, record):
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending:
+                self.stream.write("".join(self._pending))
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+class _BurstFlushListener(QueueListener):
+    """QueueListener that flushes its handlers each time the queue drains."""
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+# Background listener writing log records to stderr, set by setup_logging
+_log_listener = None
+
+def _stop_listener(listener):
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+
+def flush_logging():
+    """Write out every queued log record before something else writes to stderr directly"""
+    if _log_listener is None:
+        return
+    _log_listener.queue.join()
+    for handler in _log_listener.handlers:
+        handler.flush()
+
 def setup_logging(verbose=False):
     """Configure logging based on verbosity level"""
-    level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+    global _log_listener
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
+    if root.handlers:
+        return
+
+    # The format only uses time, level and message, so skip collecting the
+    # caller frame, thread and process details for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+    # Hand records to a background listener so stderr writes stay off the
+    # thread driving the experiment; bursts such as the start/stop phases
+    # reach stderr as a single write once the queue drains
+    handler = _BatchingStreamHandler()
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    ))
+    log_queue = queue.Queue(-1)
+    _log_listener = _BurstFlushListener(log_queue, handler)
+    root.addHandler(QueueHandler(log_queue))
+    _log_listener.start()
+    atexit.register(_stop_listener, _log_listener)
 
-def create_experiment_template(args):
-    """Create a template experiment YAML file"""
-    experiment_types = {
-        "cpu": {
-            "name": "CPU Stress Test",
-            "type": "cpu_stress",
-            "description": "Simulate high CPU load on test servers",
-            "target": {
-                "environment": "test",
-                "service": "web-server",
-                "hosts": ["test-server-01", "test-server-02"]
-            },
-            "duration": 300,  # seconds
-            "intensity": 80,  # percentage
-            "success_criteria": [
-                "Autoscaling group scales up within 2 minutes",
-                "No request timeouts during experiment"
-            ]
+# Top-level string fields every experiment definition must provide
+_REQUIRED_EXPERIMENT_FIELDS = ("name", "type")
+
+# Built-in experiment templates, keyed by the --type CLI choice
+_EXPERIMENT_TYPES = {
+    "cpu": MappingProxyType({
+        "name": "CPU Stress Test",
+        "type": "cpu_stress",
+        "description": "Simulate high CPU load on test servers",
+        "target": {
+            "environment": "test",
+            "service": "web-server",
+            "hosts": ["test-server-01", "test-server-02"]
         },
-        "memory": {
-            "name": "Memory Pressure Test",
-            "type": "memory_exhaust",
-            "description": "Simulate memory pressure on test servers",
-            "target": {
-                "environment": "test",
-                "service": "web-server", 
-                "hosts": ["test-server-01"]
-            },
-            "duration": 180,  # seconds
-            "memory_mb": 1024,  # MB to consume
-            "success_criteria": [
-                "OOM killer does not trigger",
-                "Service remains responsive"
-            ]
+        "duration": 300,  # seconds
+        "intensity": 80,  # percentage
+        "success_criteria": [
+            "Autoscaling group scales up within 2 minutes",
+            "No request timeouts during experiment"
+        ]
+    }),
+    "memory": MappingProxyType({
+        "name": "Memory Pressure Test",
+        "type": "memory_exhaust",
+        "description": "Simulate memory pressure on test servers",
+        "target": {
+            "environment": "test",
+            "service": "web-server", 
+            "hosts": ["test-server-01"]
         },
-        "network": {
-            "name": "Network Latency Test",
-            "type": "network_latency",
-            "description": "Introduce network latency between services",
-            "target": {
-                "environment": "test",
-                "service": "api-gateway",
-                "hosts": ["test-api-01"]
-            },
-            "duration": 240,  # seconds
-            "interface": "eth0",
-            "latency_ms": 100,  # milliseconds
-            "success_criteria": [
-                "Circuit breakers activate appropriately",
-                "Timeout mechanisms function correctly"
-            ]
-        }
-    }
-    
+        "duration": 180,  # seconds
+        "memory_mb": 1024,  # MB to consume
+        "success_criteria": [
+            "OOM killer does not trigger",
+            "Service remains responsive"
+        ]
+    }),
+    "network": MappingProxyType({
+        "name": "Network Latency Test",
+        "type": "network_latency",
+        "description": "Introduce network latency between services",
+        "target": {
+            "environment": "test",
+            "service": "api-gateway",
+            "hosts": ["test-api-01"]
+        },
+        "duration": 240,  # seconds
+        "interface": "eth0",
+        "latency_ms": 100,  # milliseconds
+        "success_criteria": [
+            "Circuit breakers activate appropriately",
+            "Timeout mechanisms function correctly"
+        ]
+    })
+}
+
+def create_experiment_template(args):
+    """Create a template experiment YAML file"""
     exp_type = args.type
-    if exp_type not in experiment_types:
-        logging.error(f"Unknown experiment type: {exp_type}")
-        logging.info(f"Available types: {', '.join(experiment_types.keys())}")
+    if exp_type not in _EXPERIMENT_TYPES:
+        logging.error("Unknown experiment type: %s", exp_type)
+        logging.info("Available types: %s", ', '.join(_EXPERIMENT_TYPES.keys()))
         return 1
         
-    template = experiment_types[exp_type]
+    template = dict(_EXPERIMENT_TYPES[exp_type])
     
     # Save template to file
     output_file = args.output
     with open(output_file, 'w') as f:
-        yaml.dump(template, f, default_flow_style=False)
+        yaml.dump(template, f, Dumper=_DUMPER, default_flow_style=False, sort_keys=False)
         
-    logging.info(f"Template created: {output_file}")
+    logging.info("Template created: %s", output_file)
     return 0
 
+@functools.lru_cache(maxsize=4)
+def _get_safety(config_path, mtime):
+    from safety import SafetyChecker
+    return SafetyChecker(config_path)
+
+def get_safety_checker(config_path=None):
+    """Return a SafetyChecker for config_path, reused while the file is unchanged."""
+    if config_path is None:
+        # Resolve the default file here so edits to it invalidate the cache too
+        from safety import _DEFAULT_CONFIG_FILES
+        config_path = next((f for f in _DEFAULT_CONFIG_FILES if os.path.exists(f)), None)
+    try:
+        mtime = os.stat(config_path).st_mtime_ns if config_path else 0
+    except OSError:
+        mtime = 0
+    return _get_safety(config_path, mtime)
+
+def check_safety_cached(safety, experiment_bytes, experiment):
+    """Run the safety check, reusing a recent decision for the same file, config and host."""
+    from safety_cache import SafetyDecisionCache
+
+    cache = SafetyDecisionCache()
+    key = cache.make_key(experiment_bytes, safety.config)
+
+    cached = cache.get(key)
+    if cached is not None:
+        environment, is_safe, violations = cached
+        logging.info("Using cached safety decision for %s environment", environment)
+        safety.record_decision(experiment, environment, violations)
+        return is_safe, violations
+
+    is_safe, violations = safety.is_safe_to_run(experiment)
+    cache.put(key, safety.get_environment_type(), is_safe, violations)
+    return is_safe, violations
+
+def validate_experiment(experiment):
+    """Check the fields run_experiment relies on and return any issues."""
+    if not isinstance(experiment, dict):
+        return ["Experiment file must contain a YAML mapping"]
+
+    issues = []
+    for field in _REQUIRED_EXPERIMENT_FIELDS:
+        if not isinstance(experiment.get(field), str):
+            issues.append(f"Missing or non-string '{field}' field")
+
+    duration = experiment.get("duration")
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration < 0:
+        issues.append("'duration' must be a non-negative number of seconds")
+
+    target = experiment.get("target")
+    if not isinstance(target, dict):
+        issues.append("Missing 'target' mapping")
+    elif not isinstance(target.get("service"), str):
+        issues.append("Missing or non-string 'target.service' field")
+
+    return issues
+
 def run_experiment(args):
     """Run a chaos engineering experiment"""
-    # Load experiment definition
+    # Load experiment definition; the raw bytes also key the safety cache
     try:
-        with open(args.experiment, 'r') as f:
-            experiment = yaml.safe_load(f)
+        experiment_bytes = Path(args.experiment).read_bytes()
+        experiment = yaml.load(experiment_bytes, Loader=_LOADER)
     except Exception as e:
-        logging.error(f"Failed to load experiment: {e}")
+        logging.error("Failed to load experiment: %s", e)
+        return 1
+
+    issues = validate_experiment(experiment)
+    if issues:
+        logging.error("Experiment definition is invalid:")
+        for issue in issues:
+            logging.error("  - %s", issue)
         return 1
         
-    logging.info(f"Loaded experiment: {experiment['name']}")
+    logging.info("Loaded experiment: %s", experiment['name'])
     
     # Safety checks
-    safety = SafetyChecker(args.safety_config if hasattr(args, 'safety_config') else None)
+    safety = get_safety_checker(args.safety_config)
 
     # Validate safety configuration if requested
-    if hasattr(args, 'validate_safety') and args.validate_safety:
+    if args.validate_safety:
         return validate_safety_config(safety)
 
-    is_safe, violations = safety.is_safe_to_run(experiment)
+    if args.safety_cache:
+        is_safe, violations = check_safety_cached(safety, experiment_bytes, experiment)
+    else:
+        is_safe, violations = safety.is_safe_to_run(experiment)
 
     if not is_safe:
         logging.error("Safety check failed. Experiment aborted.")
         for violation in violations:
-            logging.error(f"  - {violation.violation_type}: {violation.message}")
+            logging.error("  - %s: %s", violation.violation_type, violation.message)
             if args.verbose and violation.details:
-                logging.error(f"    Details: {violation.details}")
+                logging.error("    Details: %s", violation.details)
         return 1
 
-    if args.verbose:
-        env_info = safety.get_environment_info()
-        logging.info(f"Environment detected: {env_info['environment_type']}")
-        logging.info(f"Safety policy: {env_info['policy']['enabled']} (max duration: {env_info['policy']['max_duration']}s)")
-        
     if args.dry_run:
         logging.info("Dry run complete. Experiment would be safe to execute.")
         return 0
+
+    if args.verbose:
+        env_info = safety.get_environment_info()
+        logging.info("Environment detected: %s", env_info['environment_type'])
+        logging.info("Safety policy: %s (max duration: %ss)", env_info['policy']['enabled'], env_info['policy']['max_duration'])
         
     # Setup monitoring if requested
     monitoring = None
     if args.monitor:
+        from monitoring import MonitoringClient
         monitoring_url = os.environ.get('CHAOS_MONITORING_URL', 'http://localhost:9090')
         monitoring = MonitoringClient(monitoring_url)
-        logging.info(f"Capturing baseline metrics for {experiment['target']['service']}")
+        logging.info("Capturing baseline metrics for %s", experiment['target']['service'])
         baseline = monitoring.capture_baseline(experiment['target']['service'])
-        logging.info(f"Baseline captured: {len(baseline)} metrics")
+        logging.info("Baseline captured: %s metrics", len(baseline))
     
     # Run experiment
-    runner = ExperimentRunner()
+    from experiments import ExperimentRunner
+    worker_cpus = None
+    if args.controller_cpu is not None:
+        worker_cpus = worker_cpus_excluding(args.controller_cpu)
+    runner = ExperimentRunner(worker_cpus=worker_cpus)
+    controller_state = None
     try:
-        logging.info(f"Starting experiment: {experiment['name']}")
+        logging.info("Starting experiment: %s", experiment['name'])
+        # stress-ng shares our stderr, so get the log out ahead of its output
+        flush_logging()
         runner.start(experiment)
+        if args.controller_cpu is not None:
+            controller_state = pin_controller(args.controller_cpu)
         
-        # Wait for completion
-        import time
-        logging.info(f"Experiment running for {experiment['duration']} seconds...")
-        time.sleep(experiment['duration'])
+        # Wait for completion, waking early on SIGTERM or a failed runner.
+        # Signal handlers can only be set from the main thread, and the
+        # previous one is restored so serve and embedding callers keep theirs
+        stop_event = threading.Event()
+        install_handler = threading.current_thread() is threading.main_thread()
+        if install_handler:
+            previous_handler = signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+        try:
+            logging.info("Experiment running for %s seconds...", experiment['duration'])
+            completed = runner.wait(experiment['duration'], stop_event)
+        finally:
+            if install_handler:
+                signal.signal(signal.SIGTERM,
+                              previous_handler if previous_handler is not None else signal.SIG_DFL)
+        if not completed:
+            if stop_event.is_set():
+                logging.warning("Experiment terminated by signal")
+                runner.emergency_stop()
+                return 143
+            logging.warning("Experiment process exited before the scheduled duration")
         
         # Stop experiment
         logging.info("Stopping experiment...")
         results = runner.stop()
-        logging.info(f"Experiment completed: {results}")
+        logging.info("Experiment completed: %s", results)
         
         # Generate report if monitoring was enabled
         if monitoring:
@@ -160,9 +334,10 @@ def run_experiment(args):
             comparison = monitoring.compare_with_baseline(experiment['target']['service'])
             
             if args.report:
+                from reporting import ExperimentReporter
                 reporter = ExperimentReporter()
                 report_file = reporter.generate_report(experiment, comparison)
-                logging.info(f"Report generated: {report_file}")
+                logging.info("Report generated: %s", report_file)
                 
         return 0
         
@@ -172,10 +347,73 @@ def run_experiment(args):
         return 130
         
     except Exception as e:
-        logging.error(f"Error during experiment: {e}")
+        logging.error("Error during experiment: %s", e)
         runner.emergency_stop()
         return 1
 
+    finally:
+        # Later runs in the same process (serve, in-process callers) must
+        # fork their workers with the original CPU set and priority
+        if controller_state is not None:
+            restore_controller(controller_state)
+
+def worker_cpus_excluding(cpu):
+    """Return the CPUs stress workers may use so they stay off the controller's CPU, or None."""
+    try:
+        available = os.sched_getaffinity(0)
+    except AttributeError:
+        logging.warning("CPU affinity is not supported on this platform")
+        return None
+
+    worker_cpus = available - {cpu}
+    if not worker_cpus:
+        logging.warning("No CPU left for stress workers besides CPU %s; not restricting them", cpu)
+        return None
+    return worker_cpus
+
+def pin_controller(cpu):
+    """Pin the controller to one CPU, away from the stress workers, and raise its priority.
+
+    Returns the previous (affinity, niceness) for restore_controller; either
+    is None when it was not changed.
+    """
+    # Called after runner.start so the stress-ng children keep the full CPU set
+    affinity = None
+    try:
+        previous_affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {cpu})
+        affinity = previous_affinity
+        logging.info("Controller pinned to CPU %s", cpu)
+    except AttributeError:
+        logging.warning("CPU affinity is not supported on this platform")
+    except OSError as e:
+        logging.warning("Failed to pin controller to CPU %s: %s", cpu, e)
+
+    niceness = None
+    try:
+        previous_niceness = os.nice(0)
+        os.nice(-5)
+        niceness = previous_niceness
+    except (AttributeError, OSError) as e:
+        logging.debug("Could not raise controller priority: %s", e)
+
+    return affinity, niceness
+
+def restore_controller(state):
+    """Undo pin_controller, restoring the saved CPU affinity and niceness."""
+    affinity, niceness = state
+    if affinity is not None:
+        try:
+            os.sched_setaffinity(0, affinity)
+        except OSError as e:
+            logging.warning("Failed to restore controller CPU affinity: %s", e)
+
+    if niceness is not None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, niceness)
+        except OSError as e:
+            logging.warning("Failed to restore controller priority: %s", e)
+
 def validate_safety_config(safety):
     """Validate safety configuration and return status."""
     issues = safety.validate_config()
@@ -183,7 +421,7 @@ def validate_safety_config(safety):
     if issues:
         logging.error("Safety configuration validation failed:")
         for issue in issues:
-            logging.error(f"  - {issue}")
+            logging.error("  - %s", issue)
         return 1
     else:
         logging.info("Safety configuration is valid")
@@ -192,73 +430,124 @@ def validate_safety_config(safety):
 def validate_safety_command(args):
     """Command to validate safety configuration."""
     try:
-        safety = SafetyChecker(args.safety_config)
+        safety = get_safety_checker(args.safety_config)
         issues = safety.validate_config()
 
         if issues:
             logging.error("Safety configuration validation failed:")
             for issue in issues:
-                logging.error(f"  - {issue}")
+                logging.error("  - %s", issue)
             return 1
         else:
             logging.info("Safety configuration is valid")
 
             # Show configuration summary
             env_info = safety.get_environment_info()
-            logging.info(f"Current environment: {env_info['environment_type']}")
+            logging.info("Current environment: %s", env_info['environment_type'])
 
             policy = env_info['policy']
-            logging.info(f"Experiments enabled: {policy.get('enabled', False)}")
-            logging.info(f"Max duration: {policy.get('max_duration', 0)} seconds")
-            logging.info(f"Allowed types: {policy.get('allowed_experiment_types', [])}")
-            logging.info(f"Protected services: {len(policy.get('protected_services', []))} configured")
+            logging.info("Experiments enabled: %s", policy.get('enabled', False))
+            logging.info("Max duration: %s seconds", policy.get('max_duration', 0))
+            logging.info("Allowed types: %s", policy.get('allowed_experiment_types', []))
+            logging.info("Protected services: %s configured", len(policy.get('protected_services', [])))
 
             return 0
 
     except Exception as e:
-        logging.error(f"Failed to validate safety configuration: {e}")
+        logging.error("Failed to validate safety configuration: %s", e)
         return 1
 
 def environment_info_command(args):
     """Command to show current environment information."""
     try:
-        safety = SafetyChecker(args.safety_config)
+        safety = get_safety_checker(args.safety_config)
         env_info = safety.get_environment_info()
 
         logging.info("=== Environment Information ===")
-        logging.info(f"Environment Type: {env_info['environment_type']}")
+        logging.info("Environment Type: %s", env_info['environment_type'])
 
         details = env_info['environment_details']
-        logging.info(f"Hostname: {details.get('hostname', 'unknown')}")
+        logging.info("Hostname: %s", details.get('hostname', 'unknown'))
 
         if details.get('cloud_provider'):
-            logging.info(f"Cloud Provider: {details['cloud_provider']}")
+            logging.info("Cloud Provider: %s", details['cloud_provider'])
 
         if details.get('matched_rules'):
             logging.info("Matched Detection Rules:")
             for rule in details['matched_rules']:
-                logging.info(f"  - {rule['rule']} ({rule['type']}): {rule['pattern']} -> {rule['value']}")
+                logging.info("  - %s (%s): %s -> %s", rule['rule'], rule['type'], rule['pattern'], rule['value'])
 
         policy = env_info['policy']
         logging.info("\n=== Safety Policy ===")
-        logging.info(f"Experiments Enabled: {policy.get('enabled', False)}")
-        logging.info(f"Maximum Duration: {policy.get('max_duration', 0)} seconds")
-        logging.info(f"Allowed Experiment Types: {policy.get('allowed_experiment_types', [])}")
-        logging.info(f"Protected Services: {policy.get('protected_services', [])}")
-        logging.info(f"Require Confirmation: {policy.get('require_confirmation', False)}")
+        logging.info("Experiments Enabled: %s", policy.get('enabled', False))
+        logging.info("Maximum Duration: %s seconds", policy.get('max_duration', 0))
+        logging.info("Allowed Experiment Types: %s", policy.get('allowed_experiment_types', []))
+        logging.info("Protected Services: %s", policy.get('protected_services', []))
+        logging.info("Require Confirmation: %s", policy.get('require_confirmation', False))
 
         protected_services = env_info.get('protected_services', [])
         if protected_services:
             logging.info("\n=== Service Discovery ===")
-            logging.info(f"Protected Services Found: {list(protected_services)}")
+            logging.info("Protected Services Found: %s", list(protected_services))
 
         return 0
 
     except Exception as e:
-        logging.error(f"Failed to get environment information: {e}")
+        logging.error("Failed to get environment information: %s", e)
         return 1
 
-def main():
+def serve_command(parser):
+    """Run commands read from stdin, reusing loaded modules and safety checkers between them.
+
+    Returns the status of the first command that failed, or 0 if all succeeded.
+    """
+    logging.info("Serving commands from stdin (e.g. 'validate-safety', 'env-info'); 'exit' or EOF to stop")
+    status = 0
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            logging.warning("Interrupted, stopping")
+            status = status or 130
+            break
+
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            logging.error("Could not parse command: %s", e)
+            status = status or 2
+            continue
+        if not argv:
+            continue
+        if argv[0] in ('exit', 'quit'):
+            break
+
+        # argparse writes usage and errors straight to stderr
+        flush_logging()
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit as e:
+            # argparse has already printed usage or help; --help exits with 0
+            if e.code:
+                status = status or 2
+            continue
+        if args.command == 'serve':
+            logging.error("Already serving commands")
+            status = status or 2
+            continue
+
+        setup_logging(args.verbose)
+        rc = execute_command(args, parser)
+        status = status or rc
+        if rc == 143:
+            # The run was cut short by SIGTERM, which is meant for the whole process
+            logging.warning("Terminated by signal, stopping")
+            break
+    return status
+
+def main(argv=None):
     """Main entry point for the chaos engineering mini-framework"""
     parser = argparse.ArgumentParser(
         description='Chaos Engineering Mini-Framework',
@@ -283,6 +572,12 @@ def main():
     run_parser.add_argument('--monitor', action='store_true', help='Enable monitoring integration')
     run_parser.add_argument('--report', action='store_true', help='Generate experiment report')
     run_parser.add_argument('--safety-config', help='Path to safety configuration YAML file')
+    run_parser.add_argument('--safety-cache', action='store_true',
+                           help='Reuse a recent safety decision for an unchanged experiment, config and host')
+    run_parser.add_argument('--controller-cpu', type=int,
+                           help='Pin the controller process to this CPU while the experiment runs '
+                                '(Linux) and keep the stress workers off it')
+    run_parser.set_defaults(safety_config=None, validate_safety=False)
 
     # Safety validation command
     safety_parser = subparsers.add_parser('validate-safety', help='Validate safety configuration')
@@ -291,24 +586,38 @@ def main():
     # Environment info command
     env_parser = subparsers.add_parser('env-info', help='Show current environment information')
     env_parser.add_argument('--safety-config', help='Path to safety configuration YAML file')
+
+    # Interactive command loop
+    subparsers.add_parser('serve', help='Read commands from stdin and run them in one warm process')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Setup logging
     setup_logging(args.verbose)
     
-    # Execute command
-    if args.command == 'template':
-        return create_experiment_template(args)
-    elif args.command == 'run':
-        return run_experiment(args)
-    elif args.command == 'validate-safety':
-        return validate_safety_command(args)
-    elif args.command == 'env-info':
-        return environment_info_command(args)
-    else:
-        parser.print_help()
-        return 0
+    if args.command == 'serve':
+        return serve_command(parser)
+    return execute_command(args, parser)
+
+def execute_command(args, parser):
+    """Dispatch parsed arguments to the matching command function"""
+    try:
+        if args.command == 'template':
+            return create_experiment_template(args)
+        elif args.command == 'run':
+            return run_experiment(args)
+        elif args.command == 'validate-safety':
+            return validate_safety_command(args)
+        elif args.command == 'env-info':
+            return environment_info_command(args)
+        else:
+            flush_logging()
+            parser.print_help()
+            return 0
+    except BaseException:
+        # Get queued records out before the traceback is printed
+        flush_logging()
+        raise
 
 if __name__ == "__main__":
     sys.exit(main())
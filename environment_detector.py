@@ -1,11 +1,20 @@
 # environment_detector.py
+import fnmatch
+import functools
 import os
 import socket
 import requests
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional, Tuple
 
+@functools.lru_cache(maxsize=1024)
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Compile a glob pattern into a case-insensitive, fully anchored regex."""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
 class EnvironmentDetector:
     """Detects the current environment type using various detection methods."""
 
@@ -19,6 +28,12 @@ class EnvironmentDetector:
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        # Reuse connections to the metadata service across probes
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
     def detect_environment(self) -> Tuple[str, Dict]:
         """
         Detect the current environment type and return details.
@@ -51,22 +66,38 @@ class EnvironmentDetector:
             return None
 
         cloud_providers = self.config["environment_detection"]["cloud_providers"]
+        detectors = {
+            "aws": self._detect_aws,
+            "gcp": self._detect_gcp,
+            "azure": self._detect_azure
+        }
 
-        for provider, config in cloud_providers.items():
-            try:
-                metadata_url = config["metadata_url"]
-                timeout = config.get("timeout", 2)
-
-                if provider == "aws":
-                    return self._detect_aws(metadata_url, timeout)
-                elif provider == "gcp":
-                    return self._detect_gcp(metadata_url, timeout)
-                elif provider == "azure":
-                    return self._detect_azure(metadata_url, timeout)
-
-            except Exception as e:
-                self.logger.debug(f"Failed to detect {provider}: {e}")
-                continue
+        # Probe all providers at once so a bare-metal host waits for the
+        # slowest timeout rather than the sum of them
+        executor = ThreadPoolExecutor(max_workers=max(len(cloud_providers), 1))
+        try:
+            futures = {}
+            for provider, config in cloud_providers.items():
+                if provider not in detectors:
+                    continue
+                try:
+                    future = executor.submit(detectors[provider], config["metadata_url"],
+                                             config.get("timeout", 2))
+                except Exception as e:
+                    self.logger.debug(f"Failed to detect {provider}: {e}")
+                    continue
+                futures[future] = provider
+
+            for future in as_completed(futures):
+                try:
+                    cloud_info = future.result()
+                except Exception as e:
+                    self.logger.debug(f"Failed to detect {futures[future]}: {e}")
+                    continue
+                if cloud_info:
+                    return cloud_info
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         return None
 
@@ -74,27 +105,31 @@ class EnvironmentDetector:
         """Detect AWS environment and gather metadata."""
         try:
             # Check if we can reach AWS metadata service
-            response = requests.get(f"{metadata_url}instance-id", timeout=timeout)
+            response = self._session.get(f"{metadata_url}instance-id", timeout=timeout)
             if response.status_code == 200:
                 metadata = {"instance_id": response.text.strip()}
 
                 # Try to get additional metadata
                 try:
                     # Get instance type
-                    resp = requests.get(f"{metadata_url}instance-type", timeout=timeout)
+                    resp = self._session.get(f"{metadata_url}instance-type", timeout=timeout)
                     if resp.status_code == 200:
                         metadata["instance_type"] = resp.text.strip()
 
                     # Get tags (requires IAM permissions)
-                    resp = requests.get(f"{metadata_url}tags/instance/", timeout=timeout)
+                    resp = self._session.get(f"{metadata_url}tags/instance/", timeout=timeout)
                     if resp.status_code == 200:
-                        tags = {}
-                        for tag in resp.text.strip().split('\n'):
-                            if tag:
-                                tag_resp = requests.get(f"{metadata_url}tags/instance/{tag}", timeout=timeout)
-                                if tag_resp.status_code == 200:
-                                    tags[tag] = tag_resp.text.strip()
-                        metadata["tags"] = tags
+                        tag_names = [tag for tag in resp.text.strip().split('\n') if tag]
+                        with ThreadPoolExecutor(max_workers=8) as executor:
+                            tag_responses = list(executor.map(
+                                lambda tag: self._session.get(f"{metadata_url}tags/instance/{tag}", timeout=timeout),
+                                tag_names
+                            ))
+                        metadata["tags"] = {
+                            tag: tag_resp.text.strip()
+                            for tag, tag_resp in zip(tag_names, tag_responses)
+                            if tag_resp.status_code == 200
+                        }
 
                 except Exception:
                     pass  # Some metadata might not be accessible
@@ -110,8 +145,8 @@ class EnvironmentDetector:
         """Detect GCP environment and gather metadata."""
         try:
             headers = {"Metadata-Flavor": "Google"}
-            response = requests.get(f"{metadata_url}instance/id",
-                                  headers=headers, timeout=timeout)
+            response = self._session.get(f"{metadata_url}instance/id",
+                                         headers=headers, timeout=timeout)
 
             if response.status_code == 200:
                 metadata = {"instance_id": response.text.strip()}
@@ -119,14 +154,14 @@ class EnvironmentDetector:
                 # Try to get additional metadata
                 try:
                     # Get instance name
-                    resp = requests.get(f"{metadata_url}instance/name",
-                                      headers=headers, timeout=timeout)
+                    resp = self._session.get(f"{metadata_url}instance/name",
+                                             headers=headers, timeout=timeout)
                     if resp.status_code == 200:
                         metadata["instance_name"] = resp.text.strip()
 
                     # Get project ID
-                    resp = requests.get(f"{metadata_url}project/project-id",
-                                      headers=headers, timeout=timeout)
+                    resp = self._session.get(f"{metadata_url}project/project-id",
+                                             headers=headers, timeout=timeout)
                     if resp.status_code == 200:
                         metadata["project_id"] = resp.text.strip()
 
@@ -144,9 +179,9 @@ class EnvironmentDetector:
         """Detect Azure environment and gather metadata."""
         try:
             headers = {"Metadata": "true"}
-            response = requests.get(f"{metadata_url}compute/vmId",
-                                  headers=headers, timeout=timeout,
-                                  params={"api-version": "2021-02-01", "format": "text"})
+            response = self._session.get(f"{metadata_url}compute/vmId",
+                                         headers=headers, timeout=timeout,
+                                         params={"api-version": "2021-02-01", "format": "text"})
 
             if response.status_code == 200:
                 metadata = {"vm_id": response.text.strip()}
@@ -154,16 +189,16 @@ class EnvironmentDetector:
                 # Try to get additional metadata
                 try:
                     # Get VM name
-                    resp = requests.get(f"{metadata_url}compute/name",
-                                      headers=headers, timeout=timeout,
-                                      params={"api-version": "2021-02-01", "format": "text"})
+                    resp = self._session.get(f"{metadata_url}compute/name",
+                                             headers=headers, timeout=timeout,
+                                             params={"api-version": "2021-02-01", "format": "text"})
                     if resp.status_code == 200:
                         metadata["vm_name"] = resp.text.strip()
 
                     # Get resource group
-                    resp = requests.get(f"{metadata_url}compute/resourceGroupName",
-                                      headers=headers, timeout=timeout,
-                                      params={"api-version": "2021-02-01", "format": "text"})
+                    resp = self._session.get(f"{metadata_url}compute/resourceGroupName",
+                                             headers=headers, timeout=timeout,
+                                             params={"api-version": "2021-02-01", "format": "text"})
                     if resp.status_code == 200:
                         metadata["resource_group"] = resp.text.strip()
 
@@ -185,15 +220,15 @@ class EnvironmentDetector:
         classification_rules = self.config["environment_detection"]["classification_rules"]
         hostname = detection_details["hostname"]
 
-        # Collect environment variables for matching
+        # Snapshot every environment variable the rules refer to, once
         env_vars = {}
         for rule in classification_rules:
             if "environment_vars" in rule.get("patterns", {}):
                 for env_pattern in rule["patterns"]["environment_vars"]:
                     if "=" in env_pattern:
-                        key, expected_value = env_pattern.split("=", 1)
-                        actual_value = os.environ.get(key)
-                        env_vars[key] = actual_value
+                        key = env_pattern.split("=", 1)[0]
+                        if key not in env_vars:
+                            env_vars[key] = os.environ.get(key)
 
         detection_details["environment_variables"] = env_vars
 
@@ -221,7 +256,7 @@ class EnvironmentDetector:
                 for env_pattern in patterns["environment_vars"]:
                     if "=" in env_pattern:
                         key, expected_value = env_pattern.split("=", 1)
-                        actual_value = os.environ.get(key)
+                        actual_value = env_vars[key]
                         if actual_value == expected_value:
                             detection_details["matched_rules"].append({
                                 "rule": rule_name,
@@ -258,12 +293,4 @@ class EnvironmentDetector:
 
     def _match_pattern(self, text: str, pattern: str) -> bool:
         """Match text against a glob-like pattern."""
-        # Convert glob pattern to regex
-        regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-        regex_pattern = f"^{regex_pattern}$"
-
-        try:
-            return bool(re.match(regex_pattern, text, re.IGNORECASE))
-        except re.error:
-            self.logger.warning(f"Invalid pattern: {pattern}")
-            return False
\ No newline at end of file
+        return _glob_regex(pattern).match(text) is not None
\ No newline at end of file
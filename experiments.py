@@ -1,10 +1,13 @@
 # experiments.py
 import subprocess
 import logging
+import time
 
 class ExperimentRunner:
-    def __init__(self):
+    def __init__(self, worker_cpus=None):
         self.running_experiments = []
+        # CPUs the stress-ng workers may run on; None leaves them unrestricted
+        self.worker_cpus = worker_cpus
         
     def start(self, experiment):
         experiment_type = experiment['type']
@@ -23,45 +26,78 @@ class ExperimentRunner:
     def _start_cpu_stress(self, experiment):
         # Example using stress-ng for CPU load
         intensity = experiment.get('intensity', 80)
-        cmd = f"stress-ng --cpu 1 --cpu-load {intensity} --timeout {experiment['duration']}s"
-        process = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE)
+        cmd = ["stress-ng", "--cpu", "1", "--cpu-load", str(intensity),
+               "--timeout", f"{experiment['duration']}s"] + self._taskset_args()
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
         self.running_experiments.append(('cpu_stress', process))
         
     def _start_memory_exhaust(self, experiment):
         # Memory exhaustion experiment
         memory_mb = experiment.get('memory_mb', 1024)
-        cmd = f"stress-ng --vm 1 --vm-bytes {memory_mb}M --timeout {experiment['duration']}s"
-        process = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE)
+        cmd = ["stress-ng", "--vm", "1", "--vm-bytes", f"{memory_mb}M",
+               "--timeout", f"{experiment['duration']}s"] + self._taskset_args()
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
         self.running_experiments.append(('memory_exhaust', process))
         
     def _start_network_latency(self, experiment):
         # Network latency using tc
         interface = experiment.get('interface', 'eth0')
         latency_ms = experiment.get('latency_ms', 100)
-        cmd = f"tc qdisc add dev {interface} root netem delay {latency_ms}ms"
-        subprocess.run(cmd.split(), check=True)
+        cmd = ["tc", "qdisc", "add", "dev", str(interface), "root", "netem", "delay", f"{latency_ms}ms"]
+        subprocess.run(cmd, check=True)
         self.running_experiments.append(('network_latency', interface))
         
+    def _taskset_args(self):
+        """stress-ng arguments confining its workers to worker_cpus"""
+        if not self.worker_cpus:
+            return []
+        return ["--taskset", ",".join(str(cpu) for cpu in sorted(self.worker_cpus))]
+
+    def is_healthy(self):
+        """Return False if a stress process has exited before being stopped"""
+        for exp_type, process_or_resource in self.running_experiments:
+            if exp_type != 'network_latency' and process_or_resource.poll() is not None:
+                return False
+        return True
+
+    def wait(self, duration, stop_event):
+        """Wait out the experiment duration, returning False if cut short"""
+        deadline = time.monotonic() + duration
+        remaining = duration
+        while remaining > 0:
+            if stop_event.wait(timeout=min(1.0, remaining)):
+                return False
+            if not self.is_healthy():
+                return False
+            remaining = deadline - time.monotonic()
+        return True
+
     def stop(self):
         results = {}
+        processes = []
         
         for exp_type, process_or_resource in self.running_experiments:
             if exp_type == 'network_latency':
                 # Remove network latency
                 interface = process_or_resource
-                cmd = f"tc qdisc del dev {interface} root"
-                subprocess.run(cmd.split(), check=True)
+                cmd = ["tc", "qdisc", "del", "dev", str(interface), "root"]
+                subprocess.run(cmd, check=True)
                 results[exp_type] = "completed"
             else:
-                # Kill process
+                # Signal every process first so they all shut down together
                 process = process_or_resource
                 process.terminate()
-                try:
-                    process.wait(timeout=5)
-                    results[exp_type] = "completed"
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    results[exp_type] = "force_killed"
+                processes.append((exp_type, process))
+
+        # Share one grace period across processes instead of 5s each
+        deadline = time.monotonic() + 5
+        for exp_type, process in processes:
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+                results[exp_type] = "completed"
+            except subprocess.TimeoutExpired:
+                process.kill()
+                results[exp_type] = "force_killed"
                     
         self.running_experiments = []
         return results
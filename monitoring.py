@@ -1,12 +1,28 @@
 # monitoring.py
+import json
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+
+# orjson parses large Prometheus result sets much faster when it is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 class MonitoringClient:
     def __init__(self, monitoring_url, api_key=None):
         self.monitoring_url = monitoring_url
         self.api_key = api_key
         self.baseline_metrics = {}
+
+        # Keep the connection to the monitoring system alive between polls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._auth_headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
         
     def capture_baseline(self, target_service):
         """Capture baseline metrics before experiment"""
@@ -18,15 +34,18 @@ class MonitoringClient:
         current = self._get_current_metrics(target_service)
         comparison = {}
         
+        baseline_metrics = self.baseline_metrics
         for metric, value in current.items():
-            if metric in self.baseline_metrics:
-                change = ((value - self.baseline_metrics[metric]) / 
-                          self.baseline_metrics[metric] * 100)
-                comparison[metric] = {
-                    'baseline': self.baseline_metrics[metric],
-                    'current': value,
-                    'change_percent': change
-                }
+            baseline = baseline_metrics.get(metric)
+            if baseline is None:
+                continue
+            # A zero baseline has no meaningful relative change, so report None
+            change = (value - baseline) / baseline * 100 if baseline else None
+            comparison[metric] = {
+                'baseline': baseline,
+                'current': value,
+                'change_percent': change
+            }
                 
         return comparison
     
@@ -35,16 +54,17 @@ class MonitoringClient:
         # This would integrate with your actual monitoring system
         # Example with Prometheus API
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.monitoring_url}/api/v1/query",
                 params={
                     'query': f'rate(http_requests_total{{service="{target_service}"}}[5m])'
                 },
-                headers={'Authorization': f'Bearer {self.api_key}'} if self.api_key else {}
+                headers=self._auth_headers,
+                timeout=5
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 # Process metrics data
                 metrics = self._process_prometheus_response(data)
                 return metrics
@@ -58,13 +78,13 @@ class MonitoringClient:
             
     def _process_prometheus_response(self, data):
         """Process Prometheus response into usable metrics"""
-        metrics = {}
-        
-        if 'data' in data and 'result' in data['data']:
-            for result in data['data']['result']:
-                metric_name = result['metric'].get('__name__', 'unknown')
-                if 'value' in result:
-                    # Prometheus format [timestamp, value]
-                    metrics[metric_name] = float(result['value'][1])
-                    
-        return metrics
+        results = data.get('data', {}).get('result')
+        if not results:
+            return {}
+
+        # Prometheus format [timestamp, value]
+        return {
+            result['metric'].get('__name__', 'unknown'): float(result['value'][1])
+            for result in results
+            if 'value' in result
+        }
@@ -1,8 +1,70 @@
 # reporting.py
-import matplotlib.pyplot as plt
-import pandas as pd
 import os
+from html import escape
 from datetime import datetime
+from pathlib import Path
+
+# Fixed report skeleton, filled in with str.format_map per report
+_HTML_REPORT_TEMPLATE = """\
+<html>
+<head>
+    <title>Chaos Experiment Report: {name}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ text-align: left; padding: 8px; border: 1px solid #ddd; }}
+        th {{ background-color: #f2f2f2; }}
+        .summary {{ margin-bottom: 20px; }}
+        .metrics {{ margin-top: 20px; }}
+        .plot {{ margin-top: 30px; text-align: center; }}
+    </style>
+</head>
+<body>
+    <h1>Chaos Experiment Report</h1>
+
+    <div class="summary">
+        <h2>Experiment Summary</h2>
+        <p><strong>Name:</strong> {name}</p>
+        <p><strong>Type:</strong> {type}</p>
+        <p><strong>Description:</strong> {description}</p>
+        <p><strong>Duration:</strong> {duration} seconds</p>
+        <p><strong>Target Environment:</strong> {environment}</p>
+        <p><strong>Target Service:</strong> {service}</p>
+    </div>
+
+    <div class="metrics">
+        <h2>Metrics Impact</h2>
+        <table>
+            <tr>
+                <th>Metric</th>
+                <th>Baseline</th>
+                <th>During Experiment</th>
+                <th>Change (%)</th>
+            </tr>
+            {table_rows}
+        </table>
+    </div>
+
+    <div class="plot">
+        <h2>Visual Impact</h2>
+        {plot_svg}
+    </div>
+
+    <div class="conclusion">
+        <h2>Conclusion</h2>
+        <p>This report provides the results of a chaos engineering experiment designed to test system resilience.</p>
+        <p>Success Criteria Results:</p>
+        <ul>
+            {success_criteria_items}
+        </ul>
+    </div>
+</body>
+</html>
+"""
+
+def _format_change(change, precision=2):
+    """Format a percent change, which is None when the baseline was zero"""
+    return "n/a" if change is None else f"{change:.{precision}f}%"
 
 class ExperimentReporter:
     def __init__(self, output_dir="./reports"):
@@ -14,128 +76,80 @@ class ExperimentReporter:
         report_time = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_file = f"{self.output_dir}/{experiment['name']}_{report_time}.html"
         
-        # Convert metrics to DataFrame for easier manipulation
-        metrics_df = self._metrics_to_dataframe(metrics_comparison)
-        
         # Generate plots
-        plot_file = f"{self.output_dir}/{experiment['name']}_{report_time}.png"
-        self._generate_plots(metrics_df, plot_file, experiment['name'])
+        plot_svg = self._generate_plots(metrics_comparison, experiment['name'])
         
         # Create HTML report
-        with open(report_file, 'w') as f:
-            f.write(self._generate_html_report(experiment, metrics_df, plot_file))
+        Path(report_file).write_text(
+            self._generate_html_report(experiment, metrics_comparison, plot_svg), encoding="utf-8"
+        )
             
         return report_file
         
-    def _metrics_to_dataframe(self, metrics_comparison):
-        """Convert metrics comparison to pandas DataFrame"""
-        data = []
-        
-        for metric, values in metrics_comparison.items():
-            data.append({
-                'Metric': metric,
-                'Baseline': values['baseline'],
-                'During Experiment': values['current'],
-                'Change (%)': values['change_percent']
-            })
-            
-        return pd.DataFrame(data)
+    def _generate_plots(self, metrics_comparison, title, width=800, height=300):
+        """Generate an inline SVG bar chart of the percent change per metric"""
+        labels = list(metrics_comparison)
+        values = [values['change_percent'] for values in metrics_comparison.values()]
         
-    def _generate_plots(self, metrics_df, output_file, title):
-        """Generate visualization of the metrics"""
-        plt.figure(figsize=(10, 6))
-        
-        # Create bar chart of percent changes
-        metrics_df.plot(
-            x='Metric', 
-            y='Change (%)', 
-            kind='bar',
-            title=f"Impact of Chaos Experiment: {title}"
-        )
+        # Bars grow up or down from a zero line in the middle of the plot area
+        top, bottom, side = 40, 60, 40
+        half_height = (height - top - bottom) / 2
+        zero_y = top + half_height
+        vmax = max(max((abs(v) for v in values if v is not None), default=0.0), 1.0)
+        slot = (width - 2 * side) / max(len(values), 1)
+        bar_width = slot * 0.6
         
-        plt.tight_layout()
-        plt.savefig(output_file)
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Arial, sans-serif" font-size="12">',
+            f'<text x="{width / 2:.1f}" y="20" text-anchor="middle" font-size="16">'
+            f'Impact of Chaos Experiment: {escape(str(title))}</text>',
+            f'<line x1="{side}" y1="{zero_y:.1f}" x2="{width - side}" y2="{zero_y:.1f}" stroke="#333"/>',
+        ]
+        for i, (label, value) in enumerate(zip(labels, values)):
+            # Metrics without a relative change get an 'n/a' label on the zero line but no bar
+            bar_height = abs(value) / vmax * half_height if value is not None else 0.0
+            x = side + i * slot + (slot - bar_width) / 2
+            up = value is None or value >= 0
+            y = zero_y - bar_height if up else zero_y
+            center = x + bar_width / 2
+            value_y = y - 4 if up else y + bar_height + 14
+            if value is not None:
+                parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" height="{bar_height:.1f}" fill="#1f77b4"/>')
+            parts.append(
+                f'<text x="{center:.1f}" y="{value_y:.1f}" text-anchor="middle">{_format_change(value, 1)}</text>'
+                f'<text x="{center:.1f}" y="{height - 15}" text-anchor="middle">{escape(str(label))}</text>'
+            )
+        parts.append('</svg>')
+        return "".join(parts)
         
-    def _generate_html_report(self, experiment, metrics_df, plot_file):
+    def _generate_html_report(self, experiment, metrics_comparison, plot_svg):
         """Generate HTML report with experiment details and results"""
-        html = f"""
-        <html>
-        <head>
-            <title>Chaos Experiment Report: {experiment['name']}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ text-align: left; padding: 8px; border: 1px solid #ddd; }}
-                th {{ background-color: #f2f2f2; }}
-                .summary {{ margin-bottom: 20px; }}
-                .metrics {{ margin-top: 20px; }}
-                .plot {{ margin-top: 30px; text-align: center; }}
-            </style>
-        </head>
-        <body>
-            <h1>Chaos Experiment Report</h1>
-            
-            <div class="summary">
-                <h2>Experiment Summary</h2>
-                <p><strong>Name:</strong> {experiment['name']}</p>
-                <p><strong>Type:</strong> {experiment['type']}</p>
-                <p><strong>Description:</strong> {experiment['description']}</p>
-                <p><strong>Duration:</strong> {experiment['duration']} seconds</p>
-                <p><strong>Target Environment:</strong> {experiment['target']['environment']}</p>
-                <p><strong>Target Service:</strong> {experiment['target']['service']}</p>
-            </div>
-            
-            <div class="metrics">
-                <h2>Metrics Impact</h2>
-                <table>
-                    <tr>
-                        <th>Metric</th>
-                        <th>Baseline</th>
-                        <th>During Experiment</th>
-                        <th>Change (%)</th>
-                    </tr>
-                    {self._generate_table_rows(metrics_df)}
-                </table>
-            </div>
-            
-            <div class="plot">
-                <h2>Visual Impact</h2>
-                <img src="{os.path.basename(plot_file)}" alt="Experiment Impact Visualization">
-            </div>
-            
-            <div class="conclusion">
-                <h2>Conclusion</h2>
-                <p>This report provides the results of a chaos engineering experiment designed to test system resilience.</p>
-                <p>Success Criteria Results:</p>
-                <ul>
-                    {self._generate_success_criteria_items(experiment)}
-                </ul>
-            </div>
-        </body>
-        </html>
-        """
-        return html
+        return _HTML_REPORT_TEMPLATE.format_map({
+            'name': experiment['name'],
+            'type': experiment['type'],
+            'description': experiment['description'],
+            'duration': experiment['duration'],
+            'environment': experiment['target']['environment'],
+            'service': experiment['target']['service'],
+            'table_rows': self._generate_table_rows(metrics_comparison),
+            'plot_svg': plot_svg,
+            'success_criteria_items': self._generate_success_criteria_items(experiment),
+        })
         
-    def _generate_table_rows(self, metrics_df):
+    def _generate_table_rows(self, metrics_comparison):
         """Generate HTML table rows for metrics"""
-        rows = ""
-        for _, row in metrics_df.iterrows():
-            rows += f"""
+        return "".join([f"""
             <tr>
-                <td>{row['Metric']}</td>
-                <td>{row['Baseline']:.2f}</td>
-                <td>{row['During Experiment']:.2f}</td>
-                <td>{row['Change (%)']:.2f}%</td>
+                <td>{metric}</td>
+                <td>{values['baseline']:.2f}</td>
+                <td>{values['current']:.2f}</td>
+                <td>{_format_change(values['change_percent'])}</td>
             </tr>
-            """
-        return rows
+            """ for metric, values in metrics_comparison.items()])
         
     def _generate_success_criteria_items(self, experiment):
         """Generate HTML list items for success criteria"""
-        items = ""
-        if 'success_criteria' in experiment:
-            for criterion in experiment['success_criteria']:
-                items += f"<li>{criterion} - <em>Manual verification required</em></li>"
-        else:
-            items = "<li>No specific success criteria defined</li>"
-        return items
+        items = "".join([f"<li>{criterion} - <em>Manual verification required</em></li>"
+                         for criterion in experiment.get('success_criteria', [])])
+        return items or "<li>No specific success criteria defined</li>"
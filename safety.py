@@ -1,11 +1,69 @@
 # safety.py
+import atexit
+import json
 import os
+import re
+import weakref
 import yaml
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, FrozenSet, List, Tuple, Optional
 from environment_detector import EnvironmentDetector
 from service_discovery import ServiceDiscovery
 
+# Prefer the libyaml-backed C loader when PyYAML was built with it
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# orjson serializes audit entries several times faster when it is installed;
+# the json fallback uses the same compact separators and raw UTF-8 output so
+# log lines match
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+# pyahocorasick matches every protected pattern in a single pass over the
+# name when installed; otherwise a regex alternation is used
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Hostname fragments the legacy manual detection treats as production
+_PROD_IDENTIFIERS = ("prod", "production", "prd")
+_PROD_IDENTIFIERS_RE = re.compile("|".join(map(re.escape, _PROD_IDENTIFIERS)))
+
+# Config files looked up, in order, when no safety config is given
+_DEFAULT_CONFIG_FILES = ("safety_config.yaml", "safety_config_default.yaml")
+
+# Checkers with audit entries possibly still buffered; held weakly so a
+# discarded checker (and its discovery session) can be collected
+_LIVE_CHECKERS: "weakref.WeakSet[SafetyChecker]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_checkers():
+    """Write out audit entries still buffered by any live SafetyChecker at exit."""
+    for checker in list(_LIVE_CHECKERS):
+        checker.flush_audit_log()
+
+def _compile_protected_matcher(patterns: List[str]) -> Optional[Callable[[str], bool]]:
+    """Build a substring matcher for protected-service patterns, or None if there are none."""
+    if not patterns:
+        return None
+
+    if ahocorasick is not None and all(patterns):
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return lambda name: next(automaton.iter(name), None) is not None
+
+    protected_re = re.compile("|".join(map(re.escape, patterns)))
+    return lambda name: protected_re.search(name) is not None
+
 class SafetyViolation:
     """Represents a safety violation with details."""
     def __init__(self, violation_type: str, message: str, details: Dict = None):
@@ -26,20 +84,42 @@ class SafetyChecker:
         self.environment_detector = EnvironmentDetector(self.config)
         self.service_discovery = ServiceDiscovery(self.config)
         self._environment_cache = None
+        self._policy_cache: Dict[str, Tuple[Dict, FrozenSet[str], Optional[Callable[[str], bool]]]] = {}
+
+        # Resolve the audit log path and create its directory up front
+        audit_config = self.config.get("audit", {})
+        self._audit_config = audit_config
+        self._audit_enabled = bool(audit_config.get("log_safety_decisions", False))
+        self._audit_log_file = audit_config.get("log_file", "./logs/safety_audit.log")
+        if self._audit_enabled:
+            try:
+                os.makedirs(os.path.dirname(self._audit_log_file) or ".", exist_ok=True)
+            except OSError as e:
+                self.logger.error(f"Failed to create audit log directory: {e}")
+
+        # Decisions that allow an experiment are written straight away so the
+        # record survives the experiment; rejections are buffered and appended
+        # in batches, with anything left over written when the process exits.
+        # is_safe_to_run_batch holds every entry back until the batch is done.
+        self._audit_buffer: List[str] = []
+        self._audit_buffer_max = audit_config.get("buffer_size", 64)
+        self._audit_flush_on_violation = audit_config.get("flush_on_violation", True)
+        self._audit_batching = False
+        _LIVE_CHECKERS.add(self)
 
     def _load_config(self, config_file: Optional[str]) -> Dict:
         """Load safety configuration from YAML file."""
         if config_file is None:
             # Look for default config files in order
-            for default_file in ["safety_config.yaml", "safety_config_default.yaml"]:
+            for default_file in _DEFAULT_CONFIG_FILES:
                 if os.path.exists(default_file):
                     config_file = default_file
                     break
 
         if config_file and os.path.exists(config_file):
             try:
-                with open(config_file, 'r') as f:
-                    config = yaml.safe_load(f)
+                with open(config_file, 'rb') as f:
+                    config = yaml.load(f, Loader=_LOADER)
                 self.logger.info(f"Loaded safety configuration from {config_file}")
                 return config
             except Exception as e:
@@ -60,23 +140,60 @@ class SafetyChecker:
             }
         }
 
-    def is_safe_to_run(self, experiment: Dict) -> Tuple[bool, List[SafetyViolation]]:
+    def is_safe_to_run(self, experiment: Dict, early_exit: bool = False) -> Tuple[bool, List[SafetyViolation]]:
         """
         Check if experiment is safe to run.
 
         Args:
             experiment: Experiment configuration dictionary
+            early_exit: Stop at the first violation instead of collecting all of them
 
         Returns:
             Tuple of (is_safe, list_of_violations)
         """
-        violations = []
-
         # Get current environment
         environment_type, env_details = self._get_environment_info()
 
         # Get environment policy
-        policy = self._get_environment_policy(environment_type)
+        policy, allowed_types, protected_match = self._resolve_policy(environment_type)
+
+        return self._check_one(experiment, environment_type, policy, allowed_types, protected_match, early_exit)
+
+    def is_safe_to_run_batch(self, experiments: List[Dict],
+                             early_exit: bool = False) -> List[Tuple[bool, List[SafetyViolation]]]:
+        """
+        Check several experiments against the current environment.
+
+        Environment detection and policy resolution happen once for the
+        whole batch, and not at all when the batch is empty.
+
+        Args:
+            experiments: Experiment configuration dictionaries
+            early_exit: Stop each check at its first violation
+
+        Returns:
+            List of (is_safe, list_of_violations) tuples, one per experiment
+        """
+        if not experiments:
+            return []
+
+        environment_type, env_details = self._get_environment_info()
+        policy, allowed_types, protected_match = self._resolve_policy(environment_type)
+
+        # Write the batch's audit entries in one append once every check is done
+        self._audit_batching = True
+        try:
+            return [self._check_one(experiment, environment_type, policy, allowed_types, protected_match, early_exit)
+                    for experiment in experiments]
+        finally:
+            self._audit_batching = False
+            self.flush_audit_log()
+
+    def _check_one(self, experiment: Dict, environment_type: str, policy: Dict,
+                   allowed_types: FrozenSet[str], protected_match: Optional[Callable[[str], bool]],
+                   early_exit: bool = False) -> Tuple[bool, List[SafetyViolation]]:
+        """Check one experiment against an already resolved environment policy, cheapest checks first."""
+        violations = []
 
         # Check if experiments are enabled in this environment
         if not policy.get("enabled", False):
@@ -85,16 +202,8 @@ class SafetyChecker:
                 f"Chaos experiments are disabled in {environment_type} environment",
                 {"environment": environment_type, "policy": policy}
             ))
-
-        # Check experiment type allowlist
-        exp_type = experiment.get("type", "unknown")
-        allowed_types = policy.get("allowed_experiment_types", [])
-        if "*" not in allowed_types and exp_type not in allowed_types:
-            violations.append(SafetyViolation(
-                "experiment_type_forbidden",
-                f"Experiment type '{exp_type}' not allowed in {environment_type} environment",
-                {"experiment_type": exp_type, "allowed_types": allowed_types}
-            ))
+            if early_exit:
+                return self._decide(experiment, environment_type, violations)
 
         # Check duration limits
         duration = experiment.get("duration", 0)
@@ -105,26 +214,52 @@ class SafetyChecker:
                 f"Experiment duration {duration}s exceeds maximum allowed {max_duration}s for {environment_type}",
                 {"duration": duration, "max_duration": max_duration}
             ))
+            if early_exit:
+                return self._decide(experiment, environment_type, violations)
+
+        # Check experiment type allowlist
+        exp_type = experiment.get("type", "unknown")
+        if "*" not in allowed_types and exp_type not in allowed_types:
+            violations.append(SafetyViolation(
+                "experiment_type_forbidden",
+                f"Experiment type '{exp_type}' not allowed in {environment_type} environment",
+                {"experiment_type": exp_type, "allowed_types": policy.get("allowed_experiment_types", [])}
+            ))
+            if early_exit:
+                return self._decide(experiment, environment_type, violations)
 
         # Check protected services
         target_service = experiment.get("target", {}).get("service", "unknown")
-        if self._is_protected_service(target_service, policy):
+        if self._is_protected_service(target_service, policy, protected_match):
             violations.append(SafetyViolation(
                 "protected_service",
                 f"Service '{target_service}' is protected and cannot be targeted for chaos experiments",
                 {"service": target_service, "environment": environment_type}
             ))
+            if early_exit:
+                return self._decide(experiment, environment_type, violations)
 
         # Check experiment-specific parameters
         param_violations = self._check_experiment_parameters(experiment)
         violations.extend(param_violations)
 
-        # Log safety decision
-        if self.config.get("audit", {}).get("log_safety_decisions", False):
-            self._log_safety_decision(experiment, environment_type, violations)
+        return self._decide(experiment, environment_type, violations)
 
+    def _decide(self, experiment: Dict, environment_type: str,
+                violations: List[SafetyViolation]) -> Tuple[bool, List[SafetyViolation]]:
+        """Record a safety decision and return it."""
+        self.record_decision(experiment, environment_type, violations)
         return len(violations) == 0, violations
 
+    def record_decision(self, experiment: Dict, environment: str, violations: List[SafetyViolation]):
+        """Write a safety decision to the audit log if audit logging is enabled."""
+        if self._audit_enabled:
+            self._log_safety_decision(experiment, environment, violations)
+
+    def get_environment_type(self) -> str:
+        """Get the detected environment type."""
+        return self._get_environment_info()[0]
+
     def _get_environment_info(self) -> Tuple[str, Dict]:
         """Get current environment information with caching."""
         if self._environment_cache is None:
@@ -149,7 +284,7 @@ class SafetyChecker:
 
         # Check hostname patterns (legacy behavior)
         hostname = os.uname().nodename.lower()
-        if any(prod_id in hostname for prod_id in ["prod", "production", "prd"]):
+        if _PROD_IDENTIFIERS_RE.search(hostname):
             return "production"
 
         return "default"
@@ -175,7 +310,17 @@ class SafetyChecker:
             "require_confirmation": True
         }
 
-    def _is_protected_service(self, service_name: str, policy: Dict) -> bool:
+    def _resolve_policy(self, environment_type: str) -> Tuple[Dict, FrozenSet[str], Optional[Callable[[str], bool]]]:
+        """Get the policy, allowed types and protected-service matcher for an environment, memoized."""
+        if environment_type not in self._policy_cache:
+            policy = self._get_environment_policy(environment_type)
+            allowed_types = frozenset(policy.get("allowed_experiment_types", []))
+            protected_match = _compile_protected_matcher(policy.get("protected_services", []))
+            self._policy_cache[environment_type] = (policy, allowed_types, protected_match)
+        return self._policy_cache[environment_type]
+
+    def _is_protected_service(self, service_name: str, policy: Dict,
+                              protected_match: Optional[Callable[[str], bool]]) -> bool:
         """Check if a service is protected."""
         protected_services = policy.get("protected_services", [])
 
@@ -184,7 +329,7 @@ class SafetyChecker:
             return True
 
         # Check static list
-        if any(ps in service_name.lower() for ps in protected_services):
+        if protected_match is not None and protected_match(service_name.lower()):
             return True
 
         # Check service discovery
@@ -249,13 +394,6 @@ class SafetyChecker:
     def _log_safety_decision(self, experiment: Dict, environment: str, violations: List[SafetyViolation]):
         """Log safety decision for audit purposes."""
         try:
-            audit_config = self.config.get("audit", {})
-            log_file = audit_config.get("log_file", "./logs/safety_audit.log")
-
-            # Ensure log directory exists
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-            import json
             from datetime import datetime
 
             audit_entry = {
@@ -271,19 +409,33 @@ class SafetyChecker:
                 } for v in violations]
             }
 
-            if audit_config.get("include_experiment_details", False):
+            if self._audit_config.get("include_experiment_details", False):
                 audit_entry["experiment"] = experiment
 
-            with open(log_file, "a") as f:
-                f.write(json.dumps(audit_entry) + "\n")
+            self._audit_buffer.append(_json_dumps(audit_entry))
+            if len(self._audit_buffer) >= self._audit_buffer_max or (
+                    not self._audit_batching and (not violations or self._audit_flush_on_violation)):
+                self.flush_audit_log()
 
         except Exception as e:
             self.logger.error(f"Failed to log safety decision: {e}")
 
+    def flush_audit_log(self):
+        """Append any buffered audit entries to the audit log."""
+        if not self._audit_buffer:
+            return
+
+        try:
+            with open(self._audit_log_file, "a", encoding="utf-8") as f:
+                f.write("\n".join(self._audit_buffer) + "\n")
+            self._audit_buffer.clear()
+        except Exception as e:
+            self.logger.error(f"Failed to write safety audit log: {e}")
+
     def get_environment_info(self) -> Dict:
         """Get detailed environment information for debugging."""
         environment_type, env_details = self._get_environment_info()
-        policy = self._get_environment_policy(environment_type)
+        policy = self._resolve_policy(environment_type)[0]
 
         return {
             "environment_type": environment_type,
@@ -0,0 +1,93 @@
+# safety_cache.py
+import hashlib
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+from safety import SafetyViolation
+
+# Variables the manual detection fallback reads in addition to any
+# referenced by the configured classification rules
+_ENVIRONMENT_VARS = ("ENVIRONMENT", "ENV", "STAGE", "KUBERNETES_SERVICE_HOST")
+
+class SafetyDecisionCache:
+    """Persistent cache of safety decisions keyed by experiment, config and host."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: int = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached decisions, defaults to
+                $XDG_CACHE_HOME/tiny-chaos/safety
+            ttl: Seconds a cached decision stays valid, bounding how long
+                cloud tag or service discovery changes can go unnoticed
+        """
+        if cache_dir is None:
+            cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+            cache_dir = os.path.join(cache_root, "tiny-chaos", "safety")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+
+    def make_key(self, experiment_bytes: bytes, config: Dict) -> str:
+        """Build the cache key for an experiment file under a loaded safety config."""
+        config_bytes = json.dumps(config, sort_keys=True, default=str).encode()
+        fingerprint = self._environment_fingerprint(config).encode()
+
+        digest = hashlib.sha256()
+        for part in (experiment_bytes, config_bytes, fingerprint):
+            digest.update(hashlib.sha256(part).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, bool, List[SafetyViolation]]]:
+        """Return (environment, is_safe, violations) for a fresh entry, or None."""
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl:
+            return None
+
+        violations = [SafetyViolation(v["type"], v["message"], v.get("details"))
+                      for v in entry.get("violations", [])]
+        return entry["environment"], entry["safe"], violations
+
+    def put(self, key: str, environment: str, is_safe: bool, violations: List[SafetyViolation]):
+        """Store a safety decision, replacing any previous entry atomically."""
+        entry = {
+            "created": time.time(),
+            "environment": environment,
+            "safe": is_safe,
+            "violations": [{
+                "type": v.violation_type,
+                "message": v.message,
+                "details": v.details
+            } for v in violations]
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, os.path.join(self.cache_dir, f"{key}.json"))
+        except OSError as e:
+            self.logger.warning(f"Failed to cache safety decision: {e}")
+
+    def _environment_fingerprint(self, config: Dict) -> str:
+        """Summarize the host inputs environment detection reads without probing the network."""
+        env_keys = set(_ENVIRONMENT_VARS)
+        rules = config.get("environment_detection", {}).get("classification_rules") or []
+        for rule in rules:
+            for env_pattern in rule.get("patterns", {}).get("environment_vars", []):
+                env_keys.add(env_pattern.split("=", 1)[0])
+
+        env_values = {key: os.environ.get(key) for key in sorted(env_keys)}
+        return json.dumps({"hostname": socket.gethostname(), "environment": env_values}, sort_keys=True)
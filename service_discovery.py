@@ -1,7 +1,20 @@
 # service_discovery.py
+import functools
+import os
 import requests
 import logging
-from typing import Dict, List, Set
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+@functools.lru_cache(maxsize=1)
+def _in_kubernetes() -> bool:
+    """Check once per process whether we're running inside a Kubernetes pod."""
+    return (
+        os.path.exists("/var/run/secrets/kubernetes.io/serviceaccount") or
+        os.environ.get("KUBERNETES_SERVICE_HOST") is not None
+    )
 
 class ServiceDiscovery:
     """Service discovery integration for identifying protected services."""
@@ -16,29 +29,58 @@ class ServiceDiscovery:
         self.config = config.get("service_discovery", {})
         self.logger = logging.getLogger(__name__)
 
-    def get_protected_services(self) -> Set[str]:
+        # Discovery results are reused for cache_ttl seconds across safety checks
+        self._ttl = self.config.get("cache_ttl", 30)
+        self._cache: Optional[Tuple[float, FrozenSet[str]]] = None
+
+        # Keep the Consul connection alive between catalog queries
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def get_protected_services(self) -> FrozenSet[str]:
         """
         Get list of protected services from all enabled service discovery systems.
 
         Returns:
             Set of protected service names
         """
-        protected_services = set()
+        if self._cache is not None and time.monotonic() - self._cache[0] < self._ttl:
+            return self._cache[1]
+
+        fetchers = []
 
         # Add services from Kubernetes if enabled
         if self.config.get("kubernetes", {}).get("enabled", False):
-            k8s_services = self._get_kubernetes_protected_services()
-            protected_services.update(k8s_services)
+            fetchers.append(self._get_kubernetes_protected_services)
 
         # Add services from Consul if enabled
         if self.config.get("consul", {}).get("enabled", False):
-            consul_services = self._get_consul_protected_services()
-            protected_services.update(consul_services)
+            fetchers.append(self._get_consul_protected_services)
 
-        return protected_services
-
-    def _get_kubernetes_protected_services(self) -> List[str]:
-        """Get protected services from Kubernetes service discovery."""
+        # Query the backends side by side so a slow Consul doesn't add to the K8s check
+        protected_services = set()
+        failed = False
+        if fetchers:
+            with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+                futures = [executor.submit(fetcher) for fetcher in fetchers]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result is None:
+                        failed = True
+                    else:
+                        protected_services.update(result)
+
+        # A failed lookup is retried on the next check rather than cached for the TTL
+        if failed:
+            return frozenset(protected_services)
+
+        self._cache = (time.monotonic(), frozenset(protected_services))
+        return self._cache[1]
+
+    def _get_kubernetes_protected_services(self) -> Optional[List[str]]:
+        """Get protected services from Kubernetes service discovery, or None if the lookup failed."""
         protected_services = []
 
         try:
@@ -59,11 +101,12 @@ class ServiceDiscovery:
 
         except Exception as e:
             self.logger.warning(f"Failed to get Kubernetes protected services: {e}")
+            return None
 
         return protected_services
 
-    def _get_consul_protected_services(self) -> List[str]:
-        """Get protected services from Consul service discovery."""
+    def _get_consul_protected_services(self) -> Optional[List[str]]:
+        """Get protected services from Consul service discovery, or None if the lookup failed."""
         protected_services = []
 
         try:
@@ -72,7 +115,7 @@ class ServiceDiscovery:
             protected_tags = consul_config.get("protected_service_tags", [])
 
             # Query Consul catalog for services
-            response = requests.get(f"{consul_url}/v1/catalog/services", timeout=5)
+            response = self._session.get(f"{consul_url}/v1/catalog/services", timeout=(1.0, 3.0))
 
             if response.status_code == 200:
                 services = response.json()
@@ -83,19 +126,19 @@ class ServiceDiscovery:
                         protected_services.append(service_name)
 
                 self.logger.debug(f"Consul protected services: {protected_services}")
+            else:
+                self.logger.warning(f"Consul catalog query returned HTTP {response.status_code}")
+                return None
 
         except Exception as e:
             self.logger.warning(f"Failed to get Consul protected services: {e}")
+            return None
 
         return protected_services
 
     def _is_kubernetes_environment(self) -> bool:
         """Check if we're running in a Kubernetes environment."""
-        import os
-        return (
-            os.path.exists("/var/run/secrets/kubernetes.io/serviceaccount") or
-            os.environ.get("KUBERNETES_SERVICE_HOST") is not None
-        )
+        return _in_kubernetes()
 
     def is_service_protected_by_discovery(self, service_name: str) -> bool:
         """
@@ -107,5 +150,4 @@ class ServiceDiscovery:
         Returns:
             True if service is protected by service discovery
         """
-        protected_services = self.get_protected_services()
-        return service_name in protected_services
\ No newline at end of file
+        return service_name in self.get_protected_services()
\ No newline at end of file